@@ -6,8 +6,35 @@ Helps diagnose issues with website scanning
 
 import sys
 import os
+import re
+import mmap
+import random
+from collections import defaultdict
 from pathlib import Path
 
+# One compiled alternation instead of seven separate substring scans.
+# Each group index maps to one feature flag; a single pass over the raw
+# bytes replaces per-feature full-file scans and the .lower() copy.
+_FEATURE_RE = re.compile(
+    rb'(?i)(<html)|(<head)|(<body)|(<title)|'
+    rb'(application/ld\+json)|(schema\.org)|(property="og:)'
+)
+_FEATURE_COUNT = 7
+
+# Optional C-backed HTML parsers: 10-50x faster than the pure-Python
+# html.parser state machine. The stdlib parser stays as the fallback.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html as _lxml_html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 # Force UTF-8 on Windows
 if sys.platform == "win32":
     os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -18,9 +45,166 @@ if sys.platform == "win32":
     except:
         pass
 
+# One walk per base path, shared by every caller in the process
+_FILE_INDEX_CACHE = {}
+
+
+def build_file_index(base):
+    """Index all files under base in a single os.scandir walk
+
+    Returns {extension: [(path, size), ...]} so callers get their file
+    lists as O(1) lookups instead of re-walking the tree per pattern.
+    Much faster than Path.rglob on large sites: no Path object per
+    intermediate directory, and sizes come from the stat info the
+    directory read already cached.
+    """
+    key = os.path.abspath(str(base))
+    if key in _FILE_INDEX_CACHE:
+        return _FILE_INDEX_CACHE[key]
+
+    index = defaultdict(list)
+    stack = [key]
+    while stack:
+        # Unreadable or missing directories degrade to an empty listing
+        # (rglob skipped them too); the diagnostic's whole job is to
+        # report on bad paths, not die on them
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    index[ext].append((entry.path, entry.stat().st_size))
+
+    _FILE_INDEX_CACHE[key] = index
+    return index
+
+
+def _process_one(path):
+    """Process a single HTML file and return its diagnostic stats
+
+    Module-level (not a closure) so ProcessPoolExecutor can dispatch it
+    to worker processes. Returns a dict; on failure the 'error' key is
+    set and everything else is best-effort.
+    """
+    import time
+    result = {
+        "path": path,
+        "size": 0,
+        "flags": (False,) * _FEATURE_COUNT,
+        "tag_count": 0,
+        "title": "",
+        "parsed_with": "",
+        "elapsed": 0.0,
+        "error": None,
+    }
+
+    start_time = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            result["size"] = file_size
+            if file_size:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                mm = b""
+
+            # Feature flags in one regex pass over the mapped bytes
+            flags = [False] * _FEATURE_COUNT
+            for m in _FEATURE_RE.finditer(mm):
+                flags[m.lastindex - 1] = True
+                if all(flags):
+                    break
+            result["flags"] = tuple(flags)
+
+            # Parse (C-backed parser when available, stdlib fallback)
+            if HAS_SELECTOLAX:
+                content = mm[:].decode('utf-8', errors='replace') if file_size else ""
+                tree = _SelectolaxParser(content)
+                title_node = tree.css_first("title")
+                result["title"] = title_node.text().strip() if title_node else ""
+                result["tag_count"] = len(
+                    {node.tag for node in tree.root.traverse()}) if tree.root else 0
+                result["parsed_with"] = "selectolax"
+            elif HAS_LXML:
+                content = mm[:].decode('utf-8', errors='replace') if file_size else ""
+                # fromstring raises on blank input; an empty file is a
+                # valid (empty) page, same as the html.parser branch
+                if content.strip():
+                    root = _lxml_html.fromstring(content)
+                    result["title"] = (root.findtext(".//title") or "").strip()
+                    result["tag_count"] = len(
+                        {el.tag for el in root.iter() if isinstance(el.tag, str)})
+                result["parsed_with"] = "lxml"
+            else:
+                import codecs
+                from html.parser import HTMLParser
+
+                class TestParser(HTMLParser):
+                    def __init__(self):
+                        super().__init__()
+                        # Dedupe as we go instead of keeping every
+                        # start-tag token and set()-ing them at the end
+                        self.tags = set()
+                        self.title = ""
+                        self._in_title = False
+
+                    def handle_starttag(self, tag, attrs):
+                        self.tags.add(tag)
+                        if tag == "title":
+                            self._in_title = True
+
+                    def handle_endtag(self, tag):
+                        if tag == "title":
+                            self._in_title = False
+
+                    def handle_data(self, data):
+                        if self._in_title and not self.title:
+                            self.title = data.strip()
+
+                parser = TestParser()
+                # Feed in 64 KiB chunks straight off the mmap so we
+                # never hold a full decoded copy of the file; the
+                # incremental decoder handles multi-byte runs split
+                # across chunk boundaries
+                decoder = codecs.getincrementaldecoder('utf-8')('replace')
+                for start in range(0, file_size, 65536):
+                    parser.feed(decoder.decode(mm[start:start + 65536]))
+                parser.feed(decoder.decode(b'', True))
+                parser.close()
+                result["title"] = parser.title
+                result["tag_count"] = len(parser.tags)
+                result["parsed_with"] = "html.parser"
+
+            if file_size:
+                mm.close()
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["elapsed"] = time.perf_counter() - start_time
+    return result
+
+
+def _process_files(paths):
+    """Run _process_one over paths, in parallel when it pays off"""
+    if len(paths) > 1 and (os.cpu_count() or 1) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                return list(ex.map(_process_one, paths, chunksize=16))
+        except Exception:
+            pass  # e.g. restricted environments without fork/spawn
+    return [_process_one(p) for p in paths]
+
+
 def debug_website(base_path):
     """Debug website scanning"""
-    
+
     base_path = Path(base_path)
     
     print("=" * 60)
@@ -36,12 +220,12 @@ def debug_website(base_path):
     print("Finding HTML files...")
     print("=" * 60)
     
-    html_files = list(base_path.rglob("*.html"))
-    
+    entries = build_file_index(base_path)[".html"]
+    html_files = [Path(path) for path, _ in entries]
+
     print(f"\nFound {len(html_files)} HTML files:")
-    for i, html_file in enumerate(html_files, 1):
+    for i, ((_, size), html_file) in enumerate(zip(entries, html_files), 1):
         rel_path = html_file.relative_to(base_path)
-        size = html_file.stat().st_size
         print(f"  {i}. {rel_path} ({size:,} bytes)")
     
     if not html_files:
@@ -52,74 +236,67 @@ def debug_website(base_path):
         print("  3. File permissions?")
         return
     
-    # Test processing first file
+    # Test processing files (parallel over worker processes). On big
+    # sites a random sample keeps the diagnostic under a second while
+    # still giving statistically useful signal; one file hides variance.
     print("\n" + "=" * 60)
-    print("Testing first HTML file...")
+    print("Testing HTML files...")
     print("=" * 60)
-    
-    test_file = html_files[0]
-    print(f"\nTesting: {test_file.name}")
-    
-    try:
-        with open(test_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        print(f"  [OK] Read file: {len(content)} characters")
-        
-        # Check for basic HTML structure
-        has_html = "<html" in content.lower()
-        has_head = "<head" in content.lower()
-        has_body = "<body" in content.lower()
-        has_title = "<title" in content.lower()
-        
+
+    paths = [path for path, _ in entries]
+    sample_size = min(50, len(paths))
+    if len(paths) > sample_size:
+        # Keep the first file for the detailed report, sample the rest
+        paths = [paths[0]] + random.sample(paths[1:], sample_size - 1)
+        print(f"\nSampling {sample_size} of {len(entries)} files")
+
+    results = _process_files(paths)
+
+    # Detailed report for the first file, same as the old single-file test
+    first = results[0]
+    print(f"\nTesting: {Path(first['path']).name}")
+    if first["error"]:
+        print(f"  [ERROR] Error processing file: {first['error']}")
+    else:
+        has_html, has_head, has_body, has_title, has_json_ld, has_schema, has_og = first["flags"]
+        print(f"  [OK] Mapped file: {first['size']:,} bytes")
         print(f"  [INFO] Has <html>: {has_html}")
         print(f"  [INFO] Has <head>: {has_head}")
         print(f"  [INFO] Has <body>: {has_body}")
         print(f"  [INFO] Has <title>: {has_title}")
-        
-        # Try to parse
-        from html.parser import HTMLParser
-        
-        class TestParser(HTMLParser):
-            def __init__(self):
-                super().__init__()
-                self.tags = []
-                self.title = ""
-                
-            def handle_starttag(self, tag, attrs):
-                self.tags.append(tag)
-                
-            def handle_data(self, data):
-                if self.tags and self.tags[-1] == "title":
-                    self.title = data.strip()
-        
-        parser = TestParser()
-        parser.feed(content)
-        
-        print(f"  [OK] Parsed successfully")
-        print(f"  [INFO] Found {len(set(parser.tags))} unique tags")
-        print(f"  [INFO] Title: {parser.title[:50] if parser.title else '(none)'}")
-        
-        # Check for structured data
-        has_json_ld = "application/ld+json" in content
-        has_schema = "schema.org" in content.lower()
-        has_og = 'property="og:' in content
-        
+        print(f"  [OK] Parsed successfully ({first['parsed_with']})")
+        print(f"  [INFO] Found {first['tag_count']} unique tags")
+        print(f"  [INFO] Title: {first['title'][:50] if first['title'] else '(none)'}")
         print(f"  [INFO] Has JSON-LD: {has_json_ld}")
         print(f"  [INFO] Has Schema.org: {has_schema}")
         print(f"  [INFO] Has Open Graph: {has_og}")
-        
-    except Exception as e:
-        print(f"  [ERROR] Error processing file: {e}")
-        import traceback
-        traceback.print_exc()
-    
+
+    # Aggregate stats over every file
+    ok_results = [r for r in results if not r["error"]]
+    errors = [r for r in results if r["error"]]
+    if len(results) > 1:
+        print(f"\nAcross {len(results)} sampled files:")
+        print(f"  [INFO] Parsed OK: {len(ok_results)}")
+        print(f"  [INFO] With <title>: {sum(1 for r in ok_results if r['flags'][3])}")
+        print(f"  [INFO] With JSON-LD: {sum(1 for r in ok_results if r['flags'][4])}")
+        print(f"  [INFO] With Schema.org: {sum(1 for r in ok_results if r['flags'][5])}")
+        print(f"  [INFO] With Open Graph: {sum(1 for r in ok_results if r['flags'][6])}")
+        if ok_results:
+            timings = sorted(r["elapsed"] for r in ok_results)
+            p50 = timings[len(timings) // 2]
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            mean_tags = sum(r["tag_count"] for r in ok_results) / len(ok_results)
+            print(f"  [INFO] Parse time p50/p95: {p50 * 1000:.1f} / {p95 * 1000:.1f} ms")
+            print(f"  [INFO] Mean unique tags: {mean_tags:.1f}")
+        for r in errors:
+            print(f"  [ERROR] {Path(r['path']).name}: {r['error']}")
+
     # Summary
     print("\n" + "=" * 60)
     print("Summary")
     print("=" * 60)
     print(f"\nTotal HTML files: {len(html_files)}")
-    print(f"Test file processed: {'Yes' if 'parser' in locals() else 'No'}")
+    print(f"Files processed: {len(ok_results)}/{len(results)}")
     
     print("\nRecommendations:")
     if len(html_files) == 0:
@@ -5,188 +5,663 @@ Scans most static website and generates a compressed .llmr file for AI consumpti
 Supports Schema.org, JSON-LD, and intelligent content detection
 """
 
+import base64
+import io
 import os
+import sys
 import json
 import re
 from pathlib import Path
 from datetime import datetime
 from html.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
+import fnmatch
 import hashlib
+import mmap
+import pickle
+import heapq
 from collections import Counter
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Dict, List, Any, Optional
 from urllib.request import urlopen
 from urllib.parse import urlparse
 
+# Optional project configuration: an llmr_config.py next to this script
+# overrides the defaults below; the script stays runnable without it.
+try:
+    import llmr_config as _config
+except ImportError:
+    _config = None
+
+
+def _cfg(name: str, default):
+    """Read one setting from llmr_config, falling back to the default"""
+    return getattr(_config, name, default)
+
+
+# Keep this a power of two (16, 32, 64...): the digest expansion works
+# on whole blocks, and downstream cosine-similarity consumers vectorize
+# cleanly when the vector fills full SIMD lanes (8/16 float32 per op)
+EMBEDDING_DIMENSIONS = _cfg("EMBEDDING_DIMENSIONS", 16)
+if EMBEDDING_DIMENSIONS & (EMBEDDING_DIMENSIONS - 1):
+    print(f"  ! EMBEDDING_DIMENSIONS={EMBEDDING_DIMENSIONS} is not a "
+          f"power of two; similarity search over the output will be "
+          f"slower than it needs to be")
+PARAGRAPHS_FOR_EMBEDDING = _cfg("PARAGRAPHS_FOR_EMBEDDING", 5)
+WORDS_PER_MINUTE = _cfg("WORDS_PER_MINUTE", 200)
+COMPRESSION_LEVEL = _cfg("COMPRESSION_LEVEL", "standard")
+
+# Worker processes for the page scan; 0/None in the config means one
+# per CPU, 1 keeps the scan serial (simplest to debug)
+PARALLEL_WORKERS = _cfg("PARALLEL_WORKERS", 0) or os.cpu_count() or 1
+
+# On-disk cache of processed page dicts, keyed by content hash, so
+# re-runs over unchanged files cost one read plus one hash
+ENABLE_CACHING = _cfg("ENABLE_CACHING", False)
+_CACHE_DIR = Path(".llmr_cache")
+_CACHE_MAX_ENTRIES = 10000
+
+
+def _prune_cache() -> None:
+    """Drop the oldest cache entries beyond the size cap"""
+    try:
+        entries = sorted(_CACHE_DIR.glob("*.pkl"),
+                         key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for stale in entries[:-_CACHE_MAX_ENTRIES] if len(entries) > _CACHE_MAX_ENTRIES else []:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+
+EMBEDDING_METHOD = _cfg("EMBEDDING_METHOD", "hash")
+_embedding_provider = None
+
+
+_emb_cache = None
+
+
+def _embed_texts(texts: List[str]) -> "tuple[List[List[float]], bool]":
+    """Embed texts with the configured method
+
+    Non-hash methods route through embedding_integration's providers,
+    whose embed_batch implementations already do length-sorted
+    batching, caching and batched API calls; any setup failure falls
+    back to the hash embeddings so a run never dies on a missing
+    library or key.
+
+    Returns (vectors, from_configured_method). The flag is False when
+    the hash fallback substituted for a failed provider, so callers
+    never persist fallback vectors under the provider's cache key.
+    """
+    global _embedding_provider
+    if EMBEDDING_METHOD != "hash":
+        fell_back = True
+        try:
+            if _embedding_provider is None:
+                from embedding_integration import EmbeddingProviderFactory
+                kwargs = {}
+                if EMBEDDING_METHOD == "sentence-transformers":
+                    kwargs["model"] = _cfg("SENTENCE_TRANSFORMER_MODEL",
+                                           "all-MiniLM-L6-v2")
+                elif EMBEDDING_METHOD == "openai":
+                    kwargs["api_key"] = _cfg("OPENAI_API_KEY", "") or None
+                elif EMBEDDING_METHOD == "cohere":
+                    kwargs["api_key"] = _cfg("COHERE_API_KEY", "") or None
+                _embedding_provider = EmbeddingProviderFactory.create(
+                    EMBEDDING_METHOD, **kwargs)
+            embeddings = _embedding_provider.embed_batch(texts)
+            return [[float(v) for v in row] for row in embeddings], True
+        except Exception as e:
+            print(f"  ! {EMBEDDING_METHOD} embeddings unavailable ({e}), "
+                  f"falling back to hash")
+    else:
+        fell_back = False
+
+    return EmbeddingGenerator.generate_batch_embeddings(
+        texts, EMBEDDING_DIMENSIONS), not fell_back
+
+
+def _batch_embed(texts: List[str]) -> List[List[float]]:
+    """Embed all page texts, deduplicating shared content first
+
+    Boilerplate-heavy sites repeat the same header/footer text across
+    many pages; each distinct text is embedded once and fanned back
+    out. With ENABLE_CACHING set, vectors also persist across runs in
+    .llmr_cache keyed by a content hash, which for API providers cuts
+    cost as well as time.
+    """
+    global _emb_cache
+
+    # Content-addressed dedupe: identical texts share one vector
+    index: Dict[str, int] = {}
+    for text in texts:
+        index.setdefault(text, len(index))
+    unique_texts = list(index)
+
+    keys = None
+    if ENABLE_CACHING:
+        if _emb_cache is None:
+            try:
+                with open(_CACHE_DIR / f"emb_{EMBEDDING_METHOD}.pkl",
+                          'rb') as f:
+                    _emb_cache = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                _emb_cache = {}
+        keys = [hashlib.blake2b(t.encode('utf-8'), digest_size=16).digest()
+                for t in unique_texts]
+        miss_idx = [i for i, k in enumerate(keys) if k not in _emb_cache]
+    else:
+        miss_idx = list(range(len(unique_texts)))
+
+    vectors: List[Optional[List[float]]] = [None] * len(unique_texts)
+    cacheable = False
+    if miss_idx:
+        new_vectors, cacheable = _embed_texts(
+            [unique_texts[i] for i in miss_idx])
+        for i, vec in zip(miss_idx, new_vectors):
+            vectors[i] = vec
+
+    if keys is not None:
+        dirty = False
+        for i, key in enumerate(keys):
+            if vectors[i] is None:
+                vectors[i] = _emb_cache[key]
+            elif cacheable and any(vectors[i]):
+                # Persist only vectors the configured method actually
+                # produced: fallback rows and the all-zero rows the API
+                # providers substitute for failed batches would poison
+                # every later run under this cache key
+                _emb_cache[key] = vectors[i]
+                dirty = True
+        if dirty:
+            try:
+                _CACHE_DIR.mkdir(exist_ok=True)
+                with open(_CACHE_DIR / f"emb_{EMBEDDING_METHOD}.pkl",
+                          'wb') as f:
+                    pickle.dump(_emb_cache, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass  # caching is best-effort
+
+    return [vectors[index[text]] for text in texts]
+
+
+# Content-type configuration, resolved once at import so the per-page
+# hot path sees plain dict lookups rather than config conditionals.
+# Type names are interned: every page dict then shares one string
+# object per type instead of boxing "WebPage" etc. thousands of times
+CUSTOM_CONTENT_TYPES = {sys.intern(t): kws
+                        for t, kws in _cfg("CUSTOM_CONTENT_TYPES", {}).items()}
+URL_TYPE_OVERRIDES = {u: sys.intern(t)
+                      for u, t in _cfg("URL_TYPE_OVERRIDES", {}).items()}
+INCLUDE_JSON_LD = _cfg("INCLUDE_JSON_LD", True)
+INCLUDE_MICRODATA = _cfg("INCLUDE_MICRODATA", False)
+
+MAX_KEYWORDS = _cfg("MAX_KEYWORDS", 10)
+MIN_KEYWORD_FREQUENCY = _cfg("MIN_KEYWORD_FREQUENCY", 1)
+CUSTOM_STOP_WORDS = frozenset(_cfg("CUSTOM_STOP_WORDS", []))
+
+MAX_TITLE_LENGTH = _cfg("MAX_TITLE_LENGTH", 100)
+MAX_DESCRIPTION_LENGTH = _cfg("MAX_DESCRIPTION_LENGTH", 200)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit chars, backing up to the last word boundary"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return cut.rsplit(' ', 1)[0] if ' ' in cut else cut
+
+
+# File filters, compiled once: the glob lists collapse into single
+# alternation regexes (one C-level scan per path instead of a Python
+# fnmatch call per pattern) and the name list into a frozenset
+SKIP_FILES = frozenset(_cfg("SKIP_FILES", []))
+_skip_patterns = _cfg("SKIP_PATTERNS", [])
+_SKIP_RE = (re.compile("|".join(fnmatch.translate(p) for p in _skip_patterns))
+            if _skip_patterns else None)
+_include_patterns = _cfg("INCLUDE_PATTERNS", [])
+_INCLUDE_RE = (re.compile("|".join(fnmatch.translate(p)
+                                   for p in _include_patterns))
+               if _include_patterns else None)
+del _skip_patterns, _include_patterns
+
+
+def should_skip(path: str) -> bool:
+    """True if path is excluded by the configured file filters"""
+    if os.path.basename(path) in SKIP_FILES:
+        return True
+    if _SKIP_RE is not None and _SKIP_RE.match(path):
+        return True
+    if _INCLUDE_RE is not None and not _INCLUDE_RE.match(path):
+        return True
+    return False
+
+# Optional xxhash: non-cryptographic, memory-bandwidth-speed digests for
+# the demonstration embeddings; blake2b is the stdlib fallback.
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Optional zstandard: writes a compressed .zst sibling next to the JSON
+# output for network shipping.
+try:
+    import zstandard as zstd
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Optional httpx: async client with connection reuse for remote mode;
+# urllib remains the sequential fallback.
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+# Optional aiofiles: overlapped file reads for the serial scan path,
+# where slow filesystems (NFS, container overlays) otherwise serialize
+# the I/O waits.
+try:
+    import aiofiles
+    HAS_AIOFILES = True
+except ImportError:
+    HAS_AIOFILES = False
+
+# Optional orjson: C serializer, ~5-10x faster than stdlib json on the
+# final dump. Output stays UTF-8 JSON either way.
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional NumPy: vectorizes embedding byte-unpacking; plain Python loops
+# remain the fallback so the tool stays dependency-free.
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Optional C-backed HTML parser: tokenizing in native code instead of the
+# pure-Python html.parser state machine is the single biggest win on the
+# per-page path. The stdlib parser remains the zero-dependency fallback.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxTree
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html as _lxml_html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Compiled once at import; per-page re.findall() calls would re-hash the
+# pattern against the small module-level regex cache on every page
+_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+_TOKEN_RE = re.compile(r'\w+')
+
+# Stop list for remote single-page mode, hoisted so its per-token
+# membership test probes one prebuilt frozenset (a handful of cache
+# lines) instead of rebuilding a set literal on every page
+_REMOTE_STOP_WORDS = frozenset((
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with'))
+
+# Tags whose text content is accumulated during parsing
+_CONTENT_TAGS = frozenset((
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "a", "li", "pre", "code"))
+_HEADING_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+_CODE_TAGS = frozenset(("pre", "code"))
+
+
+def _page_text(parser, max_paragraphs: Optional[int] = None) -> str:
+    """Combined title/description/heading/paragraph text for a page
+
+    Keywords and embeddings both need this concatenation; the header
+    part (everything but the paragraphs) is built once and cached on
+    the parser so the second caller skips the joins.
+    """
+    header = parser._text_header
+    if header is None:
+        header = " ".join([
+            parser.title,
+            parser.description,
+            " ".join(parser.headings.get("h1", [])),
+            " ".join(parser.headings.get("h2", []))
+        ])
+        parser._text_header = header
+
+    paragraphs = (parser.paragraphs if max_paragraphs is None
+                  else parser.paragraphs[:max_paragraphs])
+    if paragraphs:
+        return header + " " + " ".join(paragraphs)
+    return header
+
+
+def _quantize_embedding(embedding: List[float]) -> str:
+    """Quantize a [-1, 1] embedding to base64-encoded int8 bytes
+
+    4x smaller than the JSON float array; the recall loss is negligible
+    for the coarse hash embeddings.
+    """
+    if HAS_NUMPY:
+        q = np.clip(np.round(np.asarray(embedding, dtype=np.float32) * 127.0),
+                    -127, 127).astype(np.int8)
+        raw = q.tobytes()
+    else:
+        raw = bytes((max(-127, min(127, round(v * 127.0))) & 0xFF)
+                    for v in embedding)
+    return base64.b64encode(raw).decode("ascii")
+
+
+def decode_quantized_embedding(encoded: str) -> List[float]:
+    """Decode an emb_q field back to a list of floats"""
+    raw = base64.b64decode(encoded)
+    if HAS_NUMPY:
+        return (np.frombuffer(raw, dtype=np.int8)
+                .astype(np.float32) / 127.0).tolist()
+    return [(b - 256 if b > 127 else b) / 127.0 for b in raw]
+
+
+# COMPRESSION_LEVEL tiers mapped to zstd levels
+_ZSTD_LEVELS = {"minimal": 1, "standard": 15, "aggressive": 22}
+
+JSON_INDENT = _cfg("JSON_INDENT", 2)
+
+# Field validation: frozensets let missing fields come out of a single
+# set difference against page.keys() instead of a per-field loop
+VALIDATE_OUTPUT = _cfg("VALIDATE_OUTPUT", True)
+_REQUIRED_FIELDS = frozenset(_cfg("REQUIRED_FIELDS", ["id", "u", "t", "ti"]))
+_RECOMMENDED_FIELDS = frozenset(_cfg("RECOMMENDED_FIELDS",
+                                     ["d", "kw", "emb"]))
+
+
+def _validate_pages(pages: List[Dict[str, Any]]) -> None:
+    """Warn about pages missing required or recommended fields"""
+    for page in pages:
+        keys = page.keys()
+        missing_req = _REQUIRED_FIELDS - keys
+        missing_rec = _RECOMMENDED_FIELDS - keys
+        # The quantized embedding field satisfies the "emb" expectation
+        if "emb" in missing_rec and "emb_q" in keys:
+            missing_rec = missing_rec - {"emb"}
+        page_id = page.get("id", "?")
+        if missing_req:
+            print(f"  ! Page '{page_id}' missing required fields: "
+                  f"{', '.join(sorted(missing_req))}")
+        if missing_rec:
+            print(f"  ! Page '{page_id}' missing recommended fields: "
+                  f"{', '.join(sorted(missing_rec))}")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize one value to UTF-8 JSON bytes, via orjson when available"""
+    if HAS_ORJSON:
+        if JSON_INDENT:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        return orjson.dumps(obj)
+    if JSON_INDENT:
+        return json.dumps(obj, indent=JSON_INDENT,
+                          ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def _write_json(data: Dict[str, Any], output_path: str) -> None:
+    """Stream data to output_path without materializing one big string
+
+    Top-level fields are emitted one at a time and the pages array one
+    page at a time, so peak serialization memory is a single page
+    rather than the whole document. A 1 MiB write buffer keeps the
+    syscall count down. JSON_INDENT=None from llmr_config switches to
+    compact separators.
+
+    With zstandard installed, a compressed .zst sibling is written too
+    (typically 3-4x smaller, for shipping the index over the network);
+    the plain JSON stays the canonical output that the <link> tag
+    points at.
+    """
+    with open(output_path, 'wb', buffering=1 << 20) as f:
+        f.write(b'{\n' if JSON_INDENT else b'{')
+        for i, (key, value) in enumerate(data.items()):
+            if i:
+                f.write(b',\n' if JSON_INDENT else b',')
+            f.write(json.dumps(key).encode('utf-8') + b': ')
+            if key == "pages" and isinstance(value, list):
+                f.write(b'[')
+                for j, page in enumerate(value):
+                    if j:
+                        f.write(b',')
+                    f.write(_dumps(page))
+                f.write(b']')
+            else:
+                f.write(_dumps(value))
+        f.write(b'\n}' if JSON_INDENT else b'}')
+
+    if HAS_ZSTD:
+        level = _ZSTD_LEVELS.get(COMPRESSION_LEVEL, _ZSTD_LEVELS["standard"])
+        compressor = zstd.ZstdCompressor(level=level, threads=-1)
+        with open(output_path, 'rb') as src, \
+                open(output_path + ".zst", 'wb') as dst:
+            compressor.copy_stream(src, dst)
+
 
 class UniversalHTMLParser(HTMLParser):
     """Extract all relevant data from HTML files including Schema.org and JSON-LD"""
     
-    def __init__(self, base_url=""):
+    def __init__(self, base_url: str = ""):
         super().__init__()
-        self.base_url = base_url
-        
-        # Basic metadata
-        self.title = ""
-        self.description = ""
-        self.keywords = []
-        self.author = ""
-        self.language = "en"
-        self.canonical_url = ""
-        
+        self.base_url: str = base_url
+
+        # Basic metadata. Every attribute is declared (and annotated)
+        # here so the class has a fixed, AOT-compilable shape — no
+        # attributes appear dynamically later.
+        self.title: str = ""
+        self.description: str = ""
+        self.keywords: List[str] = []
+        self.author: str = ""
+        self.language: str = "en"
+        self.canonical_url: str = ""
+        self.og_type: Optional[str] = None
+
         # Content tracking
-        self.headings = {"h1": [], "h2": [], "h3": [], "h4": [], "h5": [], "h6": []}
-        self.paragraphs = []
-        self.links = []
-        self.images = []
-        self.videos = []
-        self.code_blocks = []
-        self.lists = []
-        
+        self.headings: Dict[str, List[str]] = {
+            "h1": [], "h2": [], "h3": [], "h4": [], "h5": [], "h6": []}
+        self.paragraphs: List[str] = []
+        self.links: List[Dict[str, str]] = []
+        self.images: List[Dict[str, str]] = []
+        self.videos: List[Dict[str, str]] = []
+        self.code_blocks: List[Dict[str, str]] = []
+        self.lists: List[Any] = []
+
         # Structured data
-        self.json_ld_data = []
-        self.microdata_items = []
-        self.rdfa_data = []
-        
+        self.json_ld_data: List[Any] = []
+        self.microdata_items: List[Dict[str, Any]] = []
+        self.rdfa_data: List[Dict[str, Any]] = []
+
         # State tracking
-        self.current_tag = None
-        self.tag_stack = []
-        self.in_script = False
-        self.in_style = False
-        self.current_content = []
-        
+        self.current_tag: Optional[str] = None
+        self.tag_stack: List[str] = []
+        self.in_script: Any = False
+        self.in_style: bool = False
+        # One reusable text buffer instead of a list of string fragments;
+        # avoids the per-chunk list append plus final join allocations
+        self.current_content = io.StringIO()
+
         # Content analysis
-        self.word_count = 0
-        self.estimated_read_time = 0
-        
+        self.word_count: int = 0
+        self.estimated_read_time: int = 0
+        self._text_header: Optional[str] = None
+
+    @staticmethod
+    def _attr(attrs, name, default=""):
+        """Scan the (name, value) attr tuples without building a dict
+
+        Most tags carry only a handful of attributes, so a linear scan
+        beats allocating and hashing a dict per start tag.
+        """
+        for key, value in attrs:
+            if key == name:
+                return value
+        return default
+
     def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
         self.current_tag = tag
         self.tag_stack.append(tag)
-        
+
         # Extract meta tags
         if tag == "meta":
-            self._parse_meta_tag(attrs_dict)
-        
+            self._parse_meta_tag(dict(attrs))
+
         # Extract links
         elif tag == "link":
-            self._parse_link_tag(attrs_dict)
-        
+            self._parse_link_tag(dict(attrs))
+
         # Extract anchors
-        elif tag == "a" and "href" in attrs_dict:
-            self.links.append({
-                "url": attrs_dict["href"],
-                "text": "",
-                "rel": attrs_dict.get("rel", ""),
-                "title": attrs_dict.get("title", "")
-            })
-        
+        elif tag == "a":
+            href = self._attr(attrs, "href", None)
+            if href is not None:
+                self.links.append({
+                    "url": href,
+                    "text": "",
+                    "rel": self._attr(attrs, "rel"),
+                    "title": self._attr(attrs, "title")
+                })
+
         # Extract images
         elif tag == "img":
             self.images.append({
-                "src": attrs_dict.get("src", ""),
-                "alt": attrs_dict.get("alt", ""),
-                "title": attrs_dict.get("title", "")
+                "src": self._attr(attrs, "src"),
+                "alt": self._attr(attrs, "alt"),
+                "title": self._attr(attrs, "title")
             })
-        
+
         # Extract videos
         elif tag == "video":
             self.videos.append({
-                "src": attrs_dict.get("src", ""),
-                "poster": attrs_dict.get("poster", "")
+                "src": self._attr(attrs, "src"),
+                "poster": self._attr(attrs, "poster")
             })
-        
+
         # Track scripts for JSON-LD
         elif tag == "script":
-            script_type = attrs_dict.get("type", "")
+            script_type = self._attr(attrs, "type")
             if script_type == "application/ld+json":
                 self.in_script = "json-ld"
             else:
                 self.in_script = True
-        
+
         # Track styles
         elif tag == "style":
             self.in_style = True
-        
+
         # Track code blocks
-        elif tag in ["pre", "code"]:
+        elif tag in _CODE_TAGS:
             self.code_blocks.append({"tag": tag, "content": ""})
-        
-        # Extract microdata
-        if "itemscope" in attrs_dict:
-            self._parse_microdata(tag, attrs_dict)
-        
+
+        # Structured-data attributes are rare; only build the dict the
+        # microdata/RDFa parsers expect when one is actually present
+        attr_names = [key for key, _ in attrs]
+        if "itemscope" in attr_names:
+            self._parse_microdata(tag, dict(attrs))
+
         # Extract RDFa
-        if any(k in attrs_dict for k in ["property", "typeof", "vocab"]):
-            self._parse_rdfa(tag, attrs_dict)
-        
+        if any(k in attr_names for k in ["property", "typeof", "vocab"]):
+            self._parse_rdfa(tag, dict(attrs))
+
         # Extract language
-        if tag == "html" and "lang" in attrs_dict:
-            self.language = attrs_dict["lang"]
+        if tag == "html":
+            lang = self._attr(attrs, "lang", None)
+            if lang is not None:
+                self.language = lang
     
     def handle_endtag(self, tag):
         if self.tag_stack and self.tag_stack[-1] == tag:
             self.tag_stack.pop()
         
         # Handle heading completion
-        if tag in self.headings and self.current_content:
-            content = " ".join(self.current_content).strip()
+        if tag in _HEADING_TAGS and self.current_content.tell():
+            content = self.current_content.getvalue().strip()
             if content:
                 self.headings[tag].append(content)
-            self.current_content = []
-        
+            self.current_content = io.StringIO()
+
         # Handle paragraph completion
-        elif tag == "p" and self.current_content:
-            content = " ".join(self.current_content).strip()
+        elif tag == "p" and self.current_content.tell():
+            content = self.current_content.getvalue().strip()
             if content:
                 self.paragraphs.append(content)
-                self.word_count += len(content.split())
-            self.current_content = []
-        
+                # Separator count approximates the word count without
+                # materializing a token list per paragraph
+                self.word_count += content.count(" ") + 1
+            self.current_content = io.StringIO()
+
         # Handle link completion
-        elif tag == "a" and self.links and self.current_content:
-            self.links[-1]["text"] = " ".join(self.current_content).strip()
-            self.current_content = []
-        
+        elif tag == "a" and self.links and self.current_content.tell():
+            self.links[-1]["text"] = self.current_content.getvalue().strip()
+            self.current_content = io.StringIO()
+
         # Handle code block completion
-        elif tag in ["pre", "code"] and self.code_blocks:
-            self.code_blocks[-1]["content"] = " ".join(self.current_content).strip()
-            self.current_content = []
-        
+        elif tag in _CODE_TAGS and self.code_blocks:
+            self.code_blocks[-1]["content"] = self.current_content.getvalue().strip()
+            self.current_content = io.StringIO()
+
         # Handle script/style end
         elif tag == "script":
-            if self.in_script == "json-ld" and self.current_content:
+            if self.in_script == "json-ld" and self.current_content.tell():
                 try:
-                    json_data = json.loads(" ".join(self.current_content))
+                    json_data = json.loads(self.current_content.getvalue())
                     self.json_ld_data.append(json_data)
                 except json.JSONDecodeError:
                     pass
             self.in_script = False
-            self.current_content = []
-        
+            self.current_content = io.StringIO()
+
         elif tag == "style":
             self.in_style = False
-            self.current_content = []
+            self.current_content = io.StringIO()
         
         self.current_tag = self.tag_stack[-1] if self.tag_stack else None
     
     def handle_data(self, data):
-        data = data.strip()
-        if not data or self.in_style:
+        # Check state flags before paying for a strip: style blocks are
+        # discarded wholesale and can be multi-KB
+        if self.in_style:
             return
-        
+
         # Capture script content (including JSON-LD)
         if self.in_script:
-            self.current_content.append(data)
+            data = data.strip()
+            if data:
+                self.current_content.write(data)
+                self.current_content.write(" ")
             return
-        
-        # Extract title
-        if self.current_tag == "title" and not self.title:
-            self.title = data
-        
+
+        if self.current_tag == "title":
+            # Extract title
+            if not self.title:
+                data = data.strip()
+                if data:
+                    self.title = data
+
         # Accumulate content for various tags
-        elif self.current_tag in ["h1", "h2", "h3", "h4", "h5", "h6", "p", "a", "li", "pre", "code"]:
-            self.current_content.append(data)
+        elif self.current_tag in _CONTENT_TAGS:
+            data = data.strip()
+            if data:
+                self.current_content.write(data)
+                self.current_content.write(" ")
     
     def _parse_meta_tag(self, attrs: Dict[str, str]):
         """Parse meta tags for metadata"""
@@ -199,7 +674,9 @@ class UniversalHTMLParser(HTMLParser):
         
         # Standard meta tags
         if name == "description" or property_name == "og:description":
-            self.description = content
+            # Keep only what can survive the output cut; downstream
+            # normalization then never touches a multi-KB meta value
+            self.description = content[:MAX_DESCRIPTION_LENGTH * 2]
         elif name == "keywords":
             self.keywords = [k.strip() for k in content.split(",") if k.strip()]
         elif name == "author" or property_name == "article:author":
@@ -209,9 +686,9 @@ class UniversalHTMLParser(HTMLParser):
         elif property_name == "og:title" and not self.title:
             self.title = content
         elif property_name == "og:type":
-            if not hasattr(self, 'og_type'):
+            if self.og_type is None:
                 self.og_type = content
-    
+
     def _parse_link_tag(self, attrs: Dict[str, str]):
         """Parse link tags"""
         rel = attrs.get("rel", "")
@@ -242,9 +719,285 @@ class UniversalHTMLParser(HTMLParser):
         self.rdfa_data.append(rdfa)
     
     def calculate_read_time(self):
-        """Calculate estimated read time (200 words per minute)"""
+        """Calculate estimated read time (WORDS_PER_MINUTE config)"""
+        if self.word_count > 0:
+            self.estimated_read_time = max(
+                1, round(self.word_count / WORDS_PER_MINUTE))
+
+
+class SelectolaxPageParser:
+    """Populate the UniversalHTMLParser attribute surface from a selectolax tree
+
+    Same public attributes (title, paragraphs, headings, ...) so
+    WebsiteScanner and the remote branch in main() work unchanged; only
+    the tokenization moves into native code.
+    """
+
+    def __init__(self, html_content: str, base_url: str = ""):
+        self.base_url = base_url
+
+        # Basic metadata
+        self.title = ""
+        self.description = ""
+        self.keywords = []
+        self.author = ""
+        self.language = "en"
+        self.canonical_url = ""
+        self.og_type: Optional[str] = None
+
+        # Content tracking
+        self.headings = {"h1": [], "h2": [], "h3": [], "h4": [], "h5": [], "h6": []}
+        self.paragraphs = []
+        self.links = []
+        self.images = []
+        self.videos = []
+        self.code_blocks = []
+        self.lists = []
+
+        # Structured data
+        self.json_ld_data = []
+        self.microdata_items = []
+        self.rdfa_data = []
+
+        # Content analysis
+        self.word_count = 0
+        self.estimated_read_time = 0
+        self._text_header: Optional[str] = None
+
+        # Blank documents keep the empty attribute surface; lxml's
+        # fromstring raises on them where the stdlib parser does not
+        if html_content and not html_content.isspace():
+            self._extract(self._build_tree(html_content))
+
+    @staticmethod
+    def _build_tree(html_content: str):
+        return _SelectolaxTree(html_content)
+
+    def _extract(self, tree):
+        root = tree.root
+        if root is None:
+            return
+
+        html_node = tree.css_first("html")
+        if html_node and html_node.attributes.get("lang"):
+            self.language = html_node.attributes["lang"]
+
+        title_node = tree.css_first("title")
+        if title_node:
+            self.title = title_node.text().strip()
+
+        for node in tree.css("meta"):
+            self._parse_meta_tag(node.attributes)
+
+        for node in tree.css("link"):
+            if node.attributes.get("rel") == "canonical":
+                self.canonical_url = node.attributes.get("href", "") or ""
+
+        for node in tree.css("a[href]"):
+            attrs = node.attributes
+            self.links.append({
+                "url": attrs.get("href", "") or "",
+                "text": node.text(deep=True).strip(),
+                "rel": attrs.get("rel", "") or "",
+                "title": attrs.get("title", "") or ""
+            })
+
+        for node in tree.css("img"):
+            attrs = node.attributes
+            self.images.append({
+                "src": attrs.get("src", "") or "",
+                "alt": attrs.get("alt", "") or "",
+                "title": attrs.get("title", "") or ""
+            })
+
+        for node in tree.css("video"):
+            attrs = node.attributes
+            self.videos.append({
+                "src": attrs.get("src", "") or "",
+                "poster": attrs.get("poster", "") or ""
+            })
+
+        for level in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            for node in tree.css(level):
+                text = node.text(deep=True).strip()
+                if text:
+                    self.headings[level].append(text)
+
+        for node in tree.css("p"):
+            text = node.text(deep=True).strip()
+            if text:
+                self.paragraphs.append(text)
+                self.word_count += text.count(" ") + 1
+
+        for tag in ("pre", "code"):
+            for node in tree.css(tag):
+                self.code_blocks.append({
+                    "tag": tag,
+                    "content": node.text(deep=True).strip()
+                })
+
+        for node in tree.css('script[type="application/ld+json"]'):
+            try:
+                self.json_ld_data.append(json.loads(node.text()))
+            except json.JSONDecodeError:
+                pass
+
+        for node in tree.css("[itemscope]"):
+            attrs = node.attributes
+            item = {"type": attrs.get("itemtype", "") or "", "properties": {}}
+            if "itemprop" in attrs:
+                item["properties"][attrs["itemprop"]] = attrs.get("content", "") or ""
+            self.microdata_items.append(item)
+
+        for node in tree.css("[property], [typeof], [vocab]"):
+            attrs = node.attributes
+            if node.tag == "meta" and attrs.get("property", "").startswith("og:"):
+                continue  # Open Graph metas are handled as meta tags
+            self.rdfa_data.append({
+                "property": attrs.get("property", "") or "",
+                "typeof": attrs.get("typeof", "") or "",
+                "content": attrs.get("content", "") or ""
+            })
+
+    def _parse_meta_tag(self, attrs):
+        """Same meta handling as UniversalHTMLParser._parse_meta_tag"""
+        name = (attrs.get("name") or "").lower()
+        property_name = (attrs.get("property") or "").lower()
+        content = attrs.get("content") or ""
+
+        if not content:
+            return
+
+        if name == "description" or property_name == "og:description":
+            # Keep only what can survive the output cut; downstream
+            # normalization then never touches a multi-KB meta value
+            self.description = content[:MAX_DESCRIPTION_LENGTH * 2]
+        elif name == "keywords":
+            self.keywords = [k.strip() for k in content.split(",") if k.strip()]
+        elif name == "author" or property_name == "article:author":
+            self.author = content
+        elif property_name == "og:title" and not self.title:
+            self.title = content
+        elif property_name == "og:type":
+            if self.og_type is None:
+                self.og_type = content
+
+    def calculate_read_time(self):
+        """Calculate estimated read time (WORDS_PER_MINUTE config)"""
         if self.word_count > 0:
-            self.estimated_read_time = max(1, round(self.word_count / 200))
+            self.estimated_read_time = max(
+                1, round(self.word_count / WORDS_PER_MINUTE))
+
+
+class LxmlPageParser(SelectolaxPageParser):
+    """SelectolaxPageParser's attribute surface on an lxml.html tree
+
+    Second tier of the parser ladder: lxml's C parser builds the tree
+    and only the handful of element kinds the page dict needs are
+    walked, so the bulk of a large document (divs, spans, styling) is
+    never touched by Python code.
+    """
+
+    @staticmethod
+    def _build_tree(html_content: str):
+        return _lxml_html.fromstring(html_content)
+
+    def _extract(self, root):
+        html_node = root if root.tag == "html" else root.find(".//html")
+        if html_node is not None and html_node.get("lang"):
+            self.language = html_node.get("lang")
+
+        title_node = root.find(".//title")
+        if title_node is not None:
+            self.title = title_node.text_content().strip()
+
+        for node in root.iter("meta"):
+            self._parse_meta_tag(node.attrib)
+
+        for node in root.iter("link"):
+            if node.get("rel") == "canonical":
+                self.canonical_url = node.get("href", "")
+
+        for node in root.iter("a"):
+            href = node.get("href")
+            if href is not None:
+                self.links.append({
+                    "url": href,
+                    "text": node.text_content().strip(),
+                    "rel": node.get("rel", ""),
+                    "title": node.get("title", "")
+                })
+
+        for node in root.iter("img"):
+            self.images.append({
+                "src": node.get("src", ""),
+                "alt": node.get("alt", ""),
+                "title": node.get("title", "")
+            })
+
+        for node in root.iter("video"):
+            self.videos.append({
+                "src": node.get("src", ""),
+                "poster": node.get("poster", "")
+            })
+
+        for level in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            for node in root.iter(level):
+                text = node.text_content().strip()
+                if text:
+                    self.headings[level].append(text)
+
+        for node in root.iter("p"):
+            text = node.text_content().strip()
+            if text:
+                self.paragraphs.append(text)
+                self.word_count += text.count(" ") + 1
+
+        for tag in ("pre", "code"):
+            for node in root.iter(tag):
+                self.code_blocks.append({
+                    "tag": tag,
+                    "content": node.text_content().strip()
+                })
+
+        for node in root.iter("script"):
+            if node.get("type") == "application/ld+json":
+                try:
+                    self.json_ld_data.append(json.loads(node.text or ""))
+                except json.JSONDecodeError:
+                    pass
+
+        for node in root.xpath("//*[@itemscope]"):
+            item = {"type": node.get("itemtype", ""), "properties": {}}
+            if node.get("itemprop") is not None:
+                item["properties"][node.get("itemprop")] = node.get("content", "")
+            self.microdata_items.append(item)
+
+        for node in root.xpath("//*[@property or @typeof or @vocab]"):
+            if node.tag == "meta" and node.get("property", "").startswith("og:"):
+                continue  # Open Graph metas are handled as meta tags
+            self.rdfa_data.append({
+                "property": node.get("property", ""),
+                "typeof": node.get("typeof", ""),
+                "content": node.get("content", "")
+            })
+
+
+def parse_html(html_content: str, base_url: str = ""):
+    """Parse a page with the fastest available engine
+
+    Returns an object with the UniversalHTMLParser attribute surface:
+    selectolax (C tokenizer) when installed, then lxml, with the stdlib
+    html.parser as the zero-dependency fallback.
+    """
+    if HAS_SELECTOLAX:
+        return SelectolaxPageParser(html_content, base_url)
+    if HAS_LXML:
+        return LxmlPageParser(html_content, base_url)
+
+    parser = UniversalHTMLParser(base_url)
+    parser.feed(html_content)
+    return parser
 
 
 class ContentTypeDetector:
@@ -269,30 +1022,74 @@ class ContentTypeDetector:
         "JobPosting": ["job", "career", "hiring"],
         "Review": ["review", "rating"]
     }
-    
+
+    # Flat keyword -> type table (first listed type wins for shared
+    # keywords, matching the old iteration order; CUSTOM_CONTENT_TYPES
+    # from llmr_config take precedence over the built-ins) plus one
+    # alternation regex, so detection is a single DFA pass instead of
+    # dozens of substring scans per page
+    _KW_TO_TYPE: Dict[str, str] = {}
+    for _stype, _kws in list(CUSTOM_CONTENT_TYPES.items()) + list(SCHEMA_TYPES.items()):
+        for _kw in _kws:
+            _KW_TO_TYPE.setdefault(_kw, sys.intern(_stype))
+    del _stype, _kws, _kw
+    _KW_RE = re.compile("|".join(map(re.escape, _KW_TO_TYPE)))
+
+    # JSON-LD fields worth copying into the schema data
+    _JSON_LD_FIELDS = ("datePublished", "dateModified", "headline",
+                       "articleBody", "keywords", "author", "publisher",
+                       "image")
+
     @staticmethod
-    def detect_type(parser: UniversalHTMLParser, url: str) -> str:
+    def analyze_json_ld(json_ld_data) -> "tuple[Optional[str], Dict[str, Any]]":
+        """Walk the JSON-LD blobs once, returning (type, relevant fields)
+
+        detect_type and extract_schema_data used to make one traversal
+        each; _process_page_worker now calls this once and feeds the
+        results to both.
+        """
+        schema_type = None
+        fields: Dict[str, Any] = {}
+        for ld in json_ld_data:
+            if not isinstance(ld, dict):
+                continue
+            if schema_type is None and "@type" in ld:
+                declared = ld["@type"]
+                if isinstance(declared, list):
+                    declared = declared[0]
+                if isinstance(declared, str):
+                    schema_type = sys.intern(declared)
+            for key in ContentTypeDetector._JSON_LD_FIELDS:
+                if key in ld:
+                    fields[key] = ld[key]
+        return schema_type, fields
+
+    @staticmethod
+    def detect_type(parser: UniversalHTMLParser, url: str,
+                    json_ld_type: Optional[str] = None) -> str:
         """Detect the content type based on various signals"""
-        
+
+        # Explicit per-URL overrides win over everything
+        override = URL_TYPE_OVERRIDES.get(url)
+        if override is not None:
+            return override
+
         # Check JSON-LD first
-        if parser.json_ld_data:
-            for ld in parser.json_ld_data:
-                if "@type" in ld:
-                    schema_type = ld["@type"]
-                    if isinstance(schema_type, list):
-                        schema_type = schema_type[0]
-                    return schema_type
-        
+        if json_ld_type is None and parser.json_ld_data:
+            json_ld_type, _ = ContentTypeDetector.analyze_json_ld(
+                parser.json_ld_data)
+        if json_ld_type is not None:
+            return json_ld_type
+
         # Check microdata
         for item in parser.microdata_items:
             if item["type"]:
                 # Extract Schema.org type
-                type_name = item["type"].split("/")[-1]
-                return type_name
+                return sys.intern(item["type"].split("/")[-1])
         
         # Check Open Graph type
-        if hasattr(parser, 'og_type'):
-            return parser.og_type
+        if parser.og_type is not None:
+            return sys.intern(parser.og_type)
         
         # Analyze URL and content
         url_lower = url.lower()
@@ -303,18 +1100,20 @@ class ContentTypeDetector:
             " ".join(parser.paragraphs[:3])
         ]).lower()
         
-        for schema_type, keywords in ContentTypeDetector.SCHEMA_TYPES.items():
-            for keyword in keywords:
-                if keyword in url_lower or keyword in content_text:
-                    return schema_type
-        
+        m = (ContentTypeDetector._KW_RE.search(url_lower)
+             or ContentTypeDetector._KW_RE.search(content_text))
+        if m:
+            return ContentTypeDetector._KW_TO_TYPE[m.group(0)]
+
         # Default to WebPage
         return "WebPage"
     
     @staticmethod
-    def extract_schema_data(parser: UniversalHTMLParser, content_type: str) -> Dict[str, Any]:
+    def extract_schema_data(parser: UniversalHTMLParser, content_type: str,
+                            json_ld_fields: Optional[Dict[str, Any]] = None
+                            ) -> Dict[str, Any]:
         """Extract structured data based on content type"""
-        
+
         data = {
             "type": content_type,
             "title": parser.title,
@@ -322,60 +1121,63 @@ class ContentTypeDetector:
             "author": parser.author,
             "language": parser.language
         }
-        
+
         # Extract from JSON-LD
-        if parser.json_ld_data:
-            for ld in parser.json_ld_data:
-                if isinstance(ld, dict):
-                    # Add relevant fields
-                    for key in ["datePublished", "dateModified", "headline", "articleBody", 
-                                "keywords", "author", "publisher", "image"]:
-                        if key in ld:
-                            data[key] = ld[key]
-        
+        if json_ld_fields is None and parser.json_ld_data:
+            _, json_ld_fields = ContentTypeDetector.analyze_json_ld(
+                parser.json_ld_data)
+        if json_ld_fields:
+            data.update(json_ld_fields)
+
         return data
 
 
 class KeywordExtractor:
     """Extract and rank keywords from content"""
     
-    # Common stop words (simplified)
-    STOP_WORDS = set([
+    # Common stop words (simplified); frozenset hashes slightly faster
+    # and documents that the table is never mutated
+    STOP_WORDS = frozenset([
         "the", "be", "to", "of", "and", "a", "in", "that", "have", "i",
         "it", "for", "not", "on", "with", "he", "as", "you", "do", "at",
         "this", "but", "his", "by", "from", "they", "we", "say", "her", "she",
         "or", "an", "will", "my", "one", "all", "would", "there", "their", "what",
         "so", "up", "out", "if", "about", "who", "get", "which", "go", "me"
-    ])
-    
+    ]) | CUSTOM_STOP_WORDS
+
     @staticmethod
-    def extract_keywords(parser: UniversalHTMLParser, max_keywords: int = 10) -> List[str]:
+    def extract_keywords(parser: UniversalHTMLParser,
+                         max_keywords: Optional[int] = None) -> List[str]:
         """Extract top keywords from content"""
-        
+
+        if max_keywords is None:
+            max_keywords = MAX_KEYWORDS
+
         # Start with explicit keywords
         keywords = set(parser.keywords)
         
-        # Combine all text content
-        all_text = " ".join([
-            parser.title,
-            parser.description,
-            " ".join(parser.headings.get("h1", [])),
-            " ".join(parser.headings.get("h2", [])),
-            " ".join(parser.paragraphs)
-        ])
-        
+        # Combine all text content (header part cached on the parser)
+        all_text = _page_text(parser)
+
         # Tokenize and clean
-        words = re.findall(r'\b[a-z]{3,}\b', all_text.lower())
-        
-        # Filter stop words and count
-        filtered_words = [w for w in words if w not in KeywordExtractor.STOP_WORDS]
-        word_counts = Counter(filtered_words)
-        
-        # Get top words
-        top_words = [word for word, count in word_counts.most_common(max_keywords)]
-        
+        words = _WORD_RE.findall(all_text.lower())
+        
+        # Counting a plain list hits Counter's C helper, so the hot
+        # per-token loop never runs in the interpreter; stop words are
+        # then dropped by touching at most ~50 keys instead of testing
+        # every token
+        word_counts = Counter(words)
+        for stop in KeywordExtractor.STOP_WORDS.intersection(word_counts):
+            del word_counts[stop]
+        
+        # Get top words; nlargest is O(N log k) for k << distinct words
+        # (the same heap path most_common takes, minus the indirection)
+        top_words = [word for word, count in heapq.nlargest(
+            max_keywords, word_counts.items(), key=itemgetter(1))
+            if count >= MIN_KEYWORD_FREQUENCY]
+
         # Combine with explicit keywords
-        keywords.update(top_words[:max_keywords])
+        keywords.update(top_words)
         
         return list(keywords)[:max_keywords]
 
@@ -383,6 +1185,32 @@ class KeywordExtractor:
 class EmbeddingGenerator:
     """Generate embeddings for content"""
     
+    @staticmethod
+    def _digest(text: str, dimensions: int) -> bytes:
+        """Exactly dimensions digest bytes for text
+
+        The embedding is a demonstration hash, not a cryptographic one:
+        xxhash runs at memory bandwidth when installed, in 16-byte
+        salted blocks; blake2b (up to 64 bytes per call) is the stdlib
+        fallback.
+        """
+        encoded = text.encode('utf-8')
+        if HAS_XXHASH:
+            raw = xxhash.xxh128(encoded).digest()
+            block = 1
+            while len(raw) < dimensions:
+                raw += xxhash.xxh128(encoded + bytes([block])).digest()
+                block += 1
+        else:
+            raw = hashlib.blake2b(
+                encoded, digest_size=min(dimensions, 64)).digest()
+            block = 1
+            while len(raw) < dimensions:
+                raw += hashlib.blake2b((text + str(block)).encode('utf-8'),
+                                       digest_size=64).digest()
+                block += 1
+        return raw[:dimensions]
+
     @staticmethod
     def generate_simple_embedding(text: str, dimensions: int = 16) -> List[float]:
         """
@@ -391,109 +1219,191 @@ class EmbeddingGenerator:
         """
         if not text:
             return [0.0] * dimensions
-        
-        # Use hash to generate consistent pseudo-random values
-        hash_val = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        
+
+        raw = EmbeddingGenerator._digest(text, dimensions)
+
+        if HAS_NUMPY:
+            # Vectorized byte-to-float expansion instead of a Python loop
+            emb = np.frombuffer(raw, dtype=np.uint8).astype(np.float32)
+            emb = (emb - 128.0) * (1.0 / 128.0)
+            return np.round(emb, 3).tolist()
+
         # Generate values between -1 and 1
-        embedding = []
-        for i in range(dimensions):
-            val = ((hash_val >> (i * 8)) % 200 - 100) / 100.0
-            embedding.append(round(val, 3))
-        
-        return embedding
+        return [round((b - 128) / 128.0, 3) for b in raw]
     
+    @staticmethod
+    def generate_batch_embeddings(texts: List[str],
+                                  dimensions: int = 16) -> List[List[float]]:
+        """Embed many texts in one vectorized pass
+
+        Hashing stays per-text (it runs in C either way), but with
+        NumPy the byte-to-float expansion and rounding happen once over
+        the whole (pages x dimensions) matrix instead of per page.
+        """
+        if not texts:
+            return []
+        if not HAS_NUMPY:
+            return [EmbeddingGenerator.generate_simple_embedding(t, dimensions)
+                    for t in texts]
+
+        raw = b"".join(
+            EmbeddingGenerator._digest(t, dimensions) if t
+            else bytes(dimensions) for t in texts)
+        emb = (np.frombuffer(raw, dtype=np.uint8)
+               .reshape(len(texts), dimensions).astype(np.float32))
+        emb = (emb - 128.0) * (1.0 / 128.0)
+        # Empty texts stay all-zero, matching generate_simple_embedding
+        empty_rows = [i for i, t in enumerate(texts) if not t]
+        if empty_rows:
+            emb[empty_rows] = 0.0
+        return np.round(emb, 3).tolist()
+
     @staticmethod
     def generate_content_embedding(parser: UniversalHTMLParser) -> List[float]:
         """Generate embedding from parsed content"""
-        
-        # Combine important content
-        content_parts = [
-            parser.title,
-            parser.description,
-            " ".join(parser.headings.get("h1", [])),
-            " ".join(parser.headings.get("h2", [])),
-            " ".join(parser.paragraphs[:5])  # First 5 paragraphs
-        ]
-        
-        content_text = " ".join(filter(None, content_parts))
-        
-        return EmbeddingGenerator.generate_simple_embedding(content_text)
 
+        # Combine important content: shared header plus the first
+        # PARAGRAPHS_FOR_EMBEDDING paragraphs
+        content_text = _page_text(parser,
+                                  max_paragraphs=PARAGRAPHS_FOR_EMBEDDING)
 
-class WebsiteScanner:
-    """Scan entire website and extract all pages"""
-    
-    def __init__(self, base_path: str, base_url: str = ""):
-        self.base_path = Path(base_path)
-        self.base_url = base_url or str(self.base_path)
-        self.pages = []
-        self.site_metadata = {
-            "title": "",
-            "description": "",
-            "author": "",
-            "nav_links": [],
-            "content_types": {}
-        }
-    
-    def scan(self) -> List[Dict[str, Any]]:
-        """Scan all HTML files in the website"""
-        
-        html_files = list(self.base_path.rglob("*.html"))
-        
-        if not html_files and self.base_path.is_file():
-            html_files = [self.base_path]
-        
-        print(f"Found {len(html_files)} HTML files")
-        
-        for html_file in html_files:
+        return EmbeddingGenerator.generate_simple_embedding(
+            content_text, EMBEDDING_DIMENSIONS)
+
+
+def _read_files_async(paths: List[Path]) -> List[bytes]:
+    """Read all paths concurrently with aiofiles
+
+    Remote-mounted and overlay filesystems serve overlapped reads far
+    faster than a serial loop; concurrency is capped so we never hold
+    more than 64 files open at once.
+    """
+    import asyncio
+
+    async def _load_all():
+        sem = asyncio.Semaphore(64)
+
+        async def _load(path):
+            async with sem:
+                async with aiofiles.open(path, 'rb') as f:
+                    return await f.read()
+
+        return await asyncio.gather(*(_load(p) for p in paths))
+
+    return asyncio.run(_load_all())
+
+
+def _map_file(f):
+    """Map an open binary file read-only; b'' for empty files
+
+    A mapping hands the parser the page cache directly instead of a
+    bytes copy per file; the fadvise hint tells the kernel the bytes
+    are read front to back exactly once.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if not size:
+        return b""
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _process_page_worker(html_path: Path, base_path: Path,
+                         base_url: str,
+                         raw: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+    """Process one HTML page; module-level so process pools can pickle it
+
+    Pass raw to skip the file read (the serial scan preloads all pages
+    asynchronously). Returns the page dict, or None on error (errors
+    are printed, not raised, so one bad page doesn't kill a parallel
+    scan).
+    """
+    try:
+        cache_path = None
+        if ENABLE_CACHING:
+            # Key on the raw bytes plus the relative path (the path
+            # feeds the page id/url), so unchanged files skip parsing,
+            # keywords and schema extraction entirely on re-runs
+            if raw is not None:
+                raw_bytes = raw
+            else:
+                # On a cache hit only the hash ever touches the pages
+                with open(html_path, 'rb') as f:
+                    raw_bytes = _map_file(f)
+            digest = hashlib.blake2b(raw_bytes, digest_size=8)
+            digest.update(str(html_path.relative_to(base_path)).encode())
+            cache_path = _CACHE_DIR / (digest.hexdigest() + ".pkl")
             try:
-                page_data = self._process_page(html_file)
-                if page_data:
-                    self.pages.append(page_data)
-                    print(f"  ✓ Processed: {html_file.name}")
-            except Exception as e:
-                print(f"  ✗ Error processing {html_file}: {e}")
-        
-        # Extract site-wide metadata from homepage
-        self._extract_site_metadata()
-        
-        return self.pages
-    
-    def _process_page(self, html_path: Path) -> Optional[Dict[str, Any]]:
-        """Process a single HTML page"""
-        
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Parse HTML
-        parser = UniversalHTMLParser(self.base_url)
-        parser.feed(html_content)
+                with open(cache_path, 'rb') as f:
+                    page_data = pickle.load(f)
+                print(f"  ✓ Cached: {html_path.name}")
+                return page_data
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass  # miss or unreadable entry: process normally
+            # str() decodes straight off the buffer, bytes or mmap
+            content = str(raw_bytes, 'utf-8', 'replace')
+            if isinstance(raw_bytes, mmap.mmap):
+                raw_bytes.close()
+            parser = parse_html(content, base_url)
+        elif raw is not None:
+            parser = parse_html(raw.decode('utf-8', errors='replace'),
+                                base_url)
+        elif HAS_SELECTOLAX or HAS_LXML:
+            # The C tokenizers want the whole document in one buffer;
+            # decoding straight off the mapping skips the intermediate
+            # bytes copy that read() would allocate
+            with open(html_path, 'rb') as f:
+                mm = _map_file(f)
+                content = str(mm, 'utf-8', 'replace')
+                if mm:
+                    mm.close()
+            parser = parse_html(content, base_url)
+        else:
+            # Feed the incremental stdlib parser in 64 KiB chunks so we
+            # never hold a second whole-file copy alongside the parse
+            # state; errors='replace' matches the remote fetch's decode
+            # tolerance
+            parser = UniversalHTMLParser(base_url)
+            with open(html_path, 'rb') as raw:
+                with io.TextIOWrapper(raw, encoding='utf-8',
+                                      errors='replace') as f:
+                    while chunk := f.read(65536):
+                        parser.feed(chunk)
+            parser.close()
         parser.calculate_read_time()
-        
+
         # Generate relative URL
-        rel_path = html_path.relative_to(self.base_path)
+        rel_path = html_path.relative_to(base_path)
         url = "/" + str(rel_path).replace("\\", "/")
-        
+
+        # One pass over the JSON-LD blobs feeds both type detection and
+        # schema extraction
+        json_ld_type, json_ld_fields = ContentTypeDetector.analyze_json_ld(
+            parser.json_ld_data)
+
         # Detect content type
-        content_type = ContentTypeDetector.detect_type(parser, url)
-        
+        content_type = ContentTypeDetector.detect_type(parser, url, json_ld_type)
+
         # Extract structured data
-        schema_data = ContentTypeDetector.extract_schema_data(parser, content_type)
-        
+        schema_data = ContentTypeDetector.extract_schema_data(
+            parser, content_type, json_ld_fields)
+
         # Extract keywords
         keywords = KeywordExtractor.extract_keywords(parser)
-        
-        # Generate embedding
-        embedding = EmbeddingGenerator.generate_content_embedding(parser)
-        
+
+        # Embedding text only; the scanner embeds all pages in one
+        # vectorized batch after the scan
+        embedding_text = _page_text(parser,
+                                    max_paragraphs=PARAGRAPHS_FOR_EMBEDDING)
+
         # Build page data
         page_data = {
             "id": html_path.stem,
             "url": url,
             "type": content_type,
             "title": parser.title,
-            "description": parser.description[:200] if parser.description else "",
+            "description": (_truncate(parser.description, MAX_DESCRIPTION_LENGTH)
+                           if parser.description else ""),
             "keywords": keywords,
             "author": parser.author,
             "language": parser.language,
@@ -508,14 +1418,147 @@ class WebsiteScanner:
             "code_blocks_count": len(parser.code_blocks),
             "has_structured_data": bool(parser.json_ld_data or parser.microdata_items),
             "schema_data": schema_data,
-            "embedding": embedding
+            "_embedding_text": embedding_text
         }
-        
-        # Add type-specific data
-        if parser.json_ld_data:
+
+        # Add type-specific data per the configured toggles
+        if INCLUDE_JSON_LD and parser.json_ld_data:
             page_data["json_ld"] = parser.json_ld_data
-        
+        if INCLUDE_MICRODATA and parser.microdata_items:
+            page_data["microdata"] = parser.microdata_items
+
+        if cache_path is not None:
+            try:
+                _CACHE_DIR.mkdir(exist_ok=True)
+                with open(cache_path, 'wb') as f:
+                    pickle.dump(page_data, f,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                pass  # caching is best-effort
+
+        print(f"  ✓ Processed: {html_path.name}")
         return page_data
+
+    except Exception as e:
+        print(f"  ✗ Error processing {html_path}: {e}")
+        return None
+
+
+class WebsiteScanner:
+    """Scan entire website and extract all pages"""
+    
+    def __init__(self, base_path: str, base_url: str = ""):
+        self.base_path = Path(base_path)
+        self.base_url = base_url or str(self.base_path)
+        self.pages = []
+        self.site_metadata = {
+            "title": "",
+            "description": "",
+            "author": "",
+            "nav_links": [],
+            "content_types": {}
+        }
+        self._html_files = []
+        self._total_source_bytes = 0
+
+    @staticmethod
+    def _walk_html(root: str):
+        """Yield (path, size) for every .html file under root
+
+        Direct os.scandir recursion is 2-3x faster than Path.rglob on
+        large trees (no PosixPath per entry) and the DirEntry stat is
+        served from the directory read, so sizes come for free.
+        """
+        # Unreadable directories and dangling symlinks are skipped, the
+        # same way Path.rglob passed over them
+        try:
+            it = os.scandir(root)
+        except OSError:
+            return
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from WebsiteScanner._walk_html(entry.path)
+                elif entry.name.endswith(".html"):
+                    try:
+                        yield entry.path, entry.stat().st_size
+                    except OSError:
+                        continue
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """Scan all HTML files in the website"""
+
+        if self.base_path.is_dir():
+            entries = sorted((path, size)
+                             for path, size in self._walk_html(str(self.base_path))
+                             if not should_skip(path))
+        else:
+            entries = []
+        html_files = [Path(path) for path, _ in entries]
+
+        if not html_files and self.base_path.is_file():
+            html_files = [self.base_path]
+            entries = [(str(self.base_path), self.base_path.stat().st_size)]
+
+        # Remember the file list and total source size so callers (e.g.
+        # the compression report in main) don't re-walk the tree
+        self._html_files = html_files
+        self._total_source_bytes = sum(size for _, size in entries)
+
+        print(f"Found {len(html_files)} HTML files")
+
+        # Pages are independent (file I/O + parse + keywords + embedding),
+        # so dispatch them over worker processes when there are enough to
+        # matter; fall back to a serial loop otherwise
+        worker = partial(_process_page_worker,
+                         base_path=self.base_path, base_url=self.base_url)
+
+        results = None
+        if len(html_files) > 1 and PARALLEL_WORKERS > 1:
+            chunksize = max(1, len(html_files) // (PARALLEL_WORKERS * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+                    results = list(executor.map(worker, html_files,
+                                                chunksize=chunksize))
+            except Exception as e:
+                print(f"  ! Process pool unavailable ({e}), scanning serially")
+
+        if results is None:
+            # Serial scan: when I/O overlap was requested but the pool
+            # didn't take it, preload all files concurrently so reads
+            # don't gate the parse loop
+            raws = None
+            if HAS_AIOFILES and PARALLEL_WORKERS > 1 and len(html_files) > 1:
+                try:
+                    raws = _read_files_async(html_files)
+                except Exception as e:
+                    print(f"  ! Async preload unavailable ({e}), "
+                          f"reading serially")
+            if raws is not None:
+                results = [worker(html_file, raw=raw)
+                           for html_file, raw in zip(html_files, raws)]
+            else:
+                results = [worker(html_file) for html_file in html_files]
+
+        self.pages = [page for page in results if page]
+
+        # Embed every page in one batch with the configured method
+        texts = [page.pop("_embedding_text", "") for page in self.pages]
+        embeddings = _batch_embed(texts)
+        for page, embedding in zip(self.pages, embeddings):
+            page["embedding"] = embedding
+
+        if ENABLE_CACHING:
+            _prune_cache()
+
+        # Extract site-wide metadata from homepage
+        self._extract_site_metadata()
+
+        return self.pages
+    
+    def _process_page(self, html_path: Path) -> Optional[Dict[str, Any]]:
+        """Process a single HTML page"""
+        return _process_page_worker(html_path, self.base_path, self.base_url)
     
     def _extract_site_metadata(self):
         """Extract site-wide metadata from homepage or other pages"""
@@ -544,11 +1587,13 @@ class LLMRGenerator:
     def generate(self, output_path: str):
         """Generate the complete .llmr file"""
         
-        # Build compressed structure
+        # Build compressed structure (one clock read so the ISO string
+        # and the epoch timestamp can't straddle a second boundary)
+        now = datetime.now()
         llmr_data = {
             "version": self.VERSION,
-            "generated": datetime.now().isoformat(),
-            "timestamp": int(datetime.now().timestamp()),
+            "generated": now.isoformat(),
+            "timestamp": int(now.timestamp()),
             "site": {
                 "title": self.scanner.site_metadata.get("title", ""),
                 "description": self.scanner.site_metadata.get("description", ""),
@@ -560,11 +1605,13 @@ class LLMRGenerator:
             "pages": self._compress_pages(self.scanner.pages),
             "stats": self._generate_stats(self.scanner.pages)
         }
-        
+
+        if VALIDATE_OUTPUT:
+            _validate_pages(llmr_data["pages"])
+
         # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(llmr_data, f, indent=2, ensure_ascii=False)
-        
+        _write_json(llmr_data, output_path)
+
         return llmr_data
     
     def _compress_pages(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -575,13 +1622,22 @@ class LLMRGenerator:
                 "id": page.get("id", "unknown"),
                 "u": page.get("url", ""),
                 "t": page.get("type", "WebPage"),
-                "ti": (page.get("title", "") or "")[:100],
-                "d": (page.get("description", "") or "")[:200],
-                "kw": (page.get("keywords", []) or [])[:10],
+                "ti": _truncate(page.get("title", "") or "", MAX_TITLE_LENGTH),
+                "d": _truncate(page.get("description", "") or "",
+                               MAX_DESCRIPTION_LENGTH),
+                "kw": (page.get("keywords", []) or [])[:MAX_KEYWORDS],
                 "wc": page.get("word_count", 0),
                 "rt": round(page.get("read_time", 0), 1),
-                "emb": page.get("embedding", [0.0] * 16)
             }
+
+            # Aggressive compression stores the embedding as base64
+            # int8 ("emb_q", 1 byte per dimension) instead of a JSON
+            # float array; decode with decode_quantized_embedding
+            embedding = page.get("embedding", [0.0] * EMBEDDING_DIMENSIONS)
+            if COMPRESSION_LEVEL == "aggressive":
+                compressed_page["emb_q"] = _quantize_embedding(embedding)
+            else:
+                compressed_page["emb"] = embedding
             
             # Optional fields – safe!
             if author := page.get("author"):
@@ -595,7 +1651,7 @@ class LLMRGenerator:
                 if cb > 0:
                     compressed_page["cb"] = cb
             if h1 := page.get("headings", {}).get("h1"):
-                compressed_page["h1"] = h1[0][:100]
+                compressed_page["h1"] = _truncate(h1[0], MAX_TITLE_LENGTH)
             
             compressed.append(compressed_page)
         return compressed
@@ -604,22 +1660,36 @@ class LLMRGenerator:
         """Site stats – bulletproof! 💪"""
         if not pages:
             return {"total_pages": 0}
-        
+
+        # Single pass over the page dicts instead of one generator per stat
+        total_words = total_read_time = 0
+        pages_with_code = pages_with_structured = 0
+        total_images = total_videos = 0
+        languages = set()
+        for page in pages:
+            total_words += page.get("word_count", 0)
+            total_read_time += page.get("read_time", 0)
+            if page.get("code_blocks_count", 0) > 0:
+                pages_with_code += 1
+            if page.get("has_structured_data"):
+                pages_with_structured += 1
+            total_images += page.get("images_count", 0)
+            total_videos += page.get("videos_count", 0)
+            languages.add(page.get("language", "en"))
+
         return {
             "total_pages": len(pages),
-            "total_words": sum(page.get("word_count", 0) for page in pages),
-            "avg_read_time": round(
-                sum(page.get("read_time", 0) for page in pages) / len(pages), 1
-            ),
-            "pages_with_code": sum(1 for p in pages if page.get("code_blocks_count", 0) > 0),
-            "pages_with_structured_data": sum(1 for p in pages if page.get("has_structured_data")),
-            "total_images": sum(page.get("images_count", 0) for page in pages),
-            "total_videos": sum(page.get("videos_count", 0) for page in pages),
-            "languages": list(set(page.get("language", "en") for page in pages))
+            "total_words": total_words,
+            "avg_read_time": round(total_read_time / len(pages), 1),
+            "pages_with_code": pages_with_code,
+            "pages_with_structured_data": pages_with_structured,
+            "total_images": total_images,
+            "total_videos": total_videos,
+            "languages": list(languages)
         }
 
 
-def fetch_remote_html(url: str) -> str:
+def _fetch_one_urllib(url: str) -> str:
     """Fetch a single remote HTML page using built-in urllib."""
     try:
         with urlopen(url) as response:
@@ -632,6 +1702,56 @@ def fetch_remote_html(url: str) -> str:
         return ""
 
 
+def fetch_remote_html(urls) -> List[str]:
+    """Fetch remote HTML pages; accepts one URL or a list of URLs
+
+    With httpx installed the URLs are fetched concurrently over one
+    keep-alive (HTTP/2 when the h2 extra is present) client, so a batch
+    pays for a single TCP+TLS handshake instead of one per URL. Without
+    it, urllib fetches them sequentially as before. Non-HTML or failed
+    fetches come back as "" in their slot.
+    """
+    if isinstance(urls, str):
+        urls = [urls]
+
+    if not HAS_HTTPX:
+        return [_fetch_one_urllib(url) for url in urls]
+
+    import asyncio
+
+    async def fetch_many(urls):
+        try:
+            limits = httpx.Limits(max_keepalive_connections=32)
+            client = httpx.AsyncClient(http2=True, timeout=10,
+                                       limits=limits,
+                                       follow_redirects=True)
+        except ImportError:
+            # http2=True needs the optional h2 package
+            client = httpx.AsyncClient(timeout=10, follow_redirects=True)
+        async def fetch_one(url):
+            response = await client.get(url)
+            # 4xx/5xx land in the exception branch below, the same way
+            # urlopen raises on them; a 404 page is not page content
+            response.raise_for_status()
+            return response
+
+        async with client:
+            return await asyncio.gather(
+                *(fetch_one(url) for url in urls), return_exceptions=True)
+
+    results = []
+    for url, response in zip(urls, asyncio.run(fetch_many(urls))):
+        if isinstance(response, Exception):
+            print(f"/!\\  Failed to fetch {url}: {response}")
+            results.append("")
+        elif "text/html" not in response.headers.get("content-type", ""):
+            print("/!\\  URL does not return HTML.")
+            results.append("")
+        else:
+            results.append(response.text)
+    return results
+
+
 def main():
     import sys
     
@@ -650,13 +1770,12 @@ def main():
         print(f"Remote mode → Output: {output_file}")
 
         print(f"Fetching: {base_path}")
-        html = fetch_remote_html(base_path)
+        html = fetch_remote_html(base_path)[0]
         if not html:
             print("Failed to fetch HTML.")
             return
 
-        parser = UniversalHTMLParser(base_path)
-        parser.feed(html)
+        parser = parse_html(html, base_path)
         if hasattr(parser, 'calculate_read_time'):
             parser.calculate_read_time()
 
@@ -666,24 +1785,27 @@ def main():
         elif "about" in base_path.lower(): content_type = "AboutPage"
 
         text = " ".join([parser.title, parser.description] + parser.paragraphs[:5])
-        words = re.findall(r'\w+', text.lower())
-        stop = {'the','a','an','and','or','but','in','on','at','to','for','of','with'}
-        keywords = [w for w in words if w not in stop][:10]
+        # Stop filtering after ten keepers; the tail of a long page
+        # never needed filtering at all
+        keywords = list(islice(
+            (w for w in _TOKEN_RE.findall(text.lower())
+             if w not in _REMOTE_STOP_WORDS), 10))
 
-        h = int(hashlib.md5(text.encode()).hexdigest(), 16)
-        embedding = [round(((h >> (i*8)) % 200 - 100) / 100.0, 3) for i in range(16)]
+        embedding = EmbeddingGenerator.generate_simple_embedding(
+            text, EMBEDDING_DIMENSIONS)
 
         page_data = {
             "id": urlparse(base_path).path.strip("/").replace("/", "_") or "index",
             "url": base_path,
             "type": content_type,
-            "title": (parser.title or "")[:100],
-            "description": (parser.description or "")[:200],
+            "title": _truncate(parser.title or "", MAX_TITLE_LENGTH),
+            "description": _truncate(parser.description or "",
+                                     MAX_DESCRIPTION_LENGTH),
             "keywords": keywords,
             "author": parser.author or "",
             "language": parser.language if parser.language != "en" else None,
             "word_count": parser.word_count,
-            "read_time": round(parser.word_count / 200, 1),
+            "read_time": round(parser.word_count / WORDS_PER_MINUTE, 1),
             "embedding": embedding,
             "has_structured_data": bool(parser.json_ld_data),
             "code_blocks_count": len(parser.code_blocks),
@@ -693,10 +1815,11 @@ def main():
         }
 
         # Build LLMR JSON
+        now = datetime.now()
         llmr_data = {
             "version": "2.0",
-            "generated": datetime.now().isoformat(),
-            "timestamp": int(datetime.now().timestamp()),
+            "generated": now.isoformat(),
+            "timestamp": int(now.timestamp()),
             "site": {
                 "title": parser.title or "Untitled",
                 "description": parser.description or "",
@@ -719,7 +1842,8 @@ def main():
                 **({"l": page_data["language"]} if page_data["language"] else {}),
                 **({"sd": 1} if page_data["has_structured_data"] else {}),
                 **({"cb": page_data["code_blocks_count"]} if page_data["code_blocks_count"] > 0 else {}),
-                **({"h1": page_data["headings"].get("h1", [""])[0][:100]} if page_data["headings"].get("h1") else {})
+                **({"h1": _truncate(page_data["headings"].get("h1", [""])[0],
+                                MAX_TITLE_LENGTH)} if page_data["headings"].get("h1") else {})
             }],
             "stats": {
                 "total_pages": 1,
@@ -733,8 +1857,7 @@ def main():
             }
         }
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(llmr_data, f, indent=2, ensure_ascii=False)
+        _write_json(llmr_data, output_file)
 
         print(f"\nSuccess: {output_file} generated!")
         print(f"Title: {parser.title[:50] or 'N/A'}...")
@@ -764,10 +1887,9 @@ def main():
         for k, v in llmr_data["stats"].items():
             print(f"  {k}: {v}")
 
-        # Compression stats
-        html_files = list(Path(base_path).rglob("*.html"))
-        if html_files:
-            orig = sum(f.stat().st_size for f in html_files)
+        # Compression stats (sizes were collected during the scan)
+        if scanner._html_files:
+            orig = scanner._total_source_bytes
             llmr = Path(output_file).stat().st_size
             red = (orig - llmr) / orig * 100
             print(f"\nCompression: {red:.1f}%")